@@ -42,7 +42,8 @@ For example:
 In this example, the calibration values of these four lines are 12, 38, 15, and
 77. Adding these together produces 142.
 """
-from typing import Tuple
+from collections import deque
+from typing import Iterable, Sequence, Tuple
 
 from aoc.day_01.seed import p1
 
@@ -59,24 +60,83 @@ replacements = (
     ("eight", 8),
     ("nine", 9),
 )
+digits = tuple((str(digit), digit) for digit in range(10))
 
+# Transition table and the digit (if any) recognised when entering each state
+Automaton = tuple[list[dict[str, int]], list[int | None]]
+
+
+def build_automaton(patterns: Sequence[tuple[str, int]]) -> Automaton:
+    """
+    Aho-Corasick automaton over the patterns, with the failure links folded
+    into the transition table so matching is a single dict lookup per char.
+    """
+    goto: list[dict[str, int]] = [{}]
+    output: list[int | None] = [None]
+    for word, digit in patterns:
+        state = 0
+        for char in word:
+            if char not in goto[state]:
+                goto[state][char] = len(goto)
+                goto.append({})
+                output.append(None)
+            state = goto[state][char]
+        output[state] = digit
+
+    # Breadth first, so the failure state is always complete before it is used.
+    # Missing transitions from the root fall back to the root itself.
+    alphabet = {char for word, _ in patterns for char in word}
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char in alphabet:
+            fallback = goto[fail[state]].get(char, 0)
+            if (child := goto[state].get(char)) is None:
+                goto[state][char] = fallback
+            else:
+                fail[child] = fallback
+                if output[child] is None:
+                    output[child] = output[fallback]
+                queue.append(child)
+    return goto, output
+
+
+def reverse_patterns(patterns: Sequence[tuple[str, int]]) -> Sequence[tuple[str, int]]:
+    return tuple((word[::-1], digit) for word, digit in patterns)
+
+
+# Pairs of automata, one reading forwards and one reading the line backwards
+digit_automata = (build_automaton(digits), build_automaton(reverse_patterns(digits)))
+spelled_automata = (
+    build_automaton(digits + replacements),
+    build_automaton(reverse_patterns(digits + replacements)),
+)
 
-def construct_calibration_number(calibration_value: str) -> int:
-    # Take the first digit and the last from a string and create a two digit
-    # number from those two values.
-    digit_1 = next(int(char) for char in calibration_value if char.isdigit())
-    digit_2 = next(int(char) for char in reversed(calibration_value) if char.isdigit())
-    return int(f"{digit_1}{digit_2}")
 
+def find_first_digit(chars: Iterable[str], automaton: Automaton) -> int:
+    # Stops at the first match, the rest of the input is never read. No pattern
+    # contains another, so the first match to end is also the first to start.
+    goto, output = automaton
+    state = 0
+    for char in chars:
+        state = goto[state].get(char, 0)
+        if (digit := output[state]) is not None:
+            return digit
+    raise ValueError("Calibration value without any digit")
 
-def replace_nums(initial_value: str) -> str:
-    value = initial_value
-    for spelled_digit, num_digit in replacements:
-        value = value.replace(
-            spelled_digit, f"{spelled_digit[0]}{num_digit}{spelled_digit[-1]}"
-        )
-    # breakpoint()
-    return value
+
+def construct_calibration_number(
+    calibration_value: str,
+    automata: tuple[Automaton, Automaton] = digit_automata,
+) -> int:
+    # Take the first digit and the last from a string and create a two digit
+    # number from those two values. The last digit is found by running the
+    # reversed automaton from the end of the string.
+    forward, backward = automata
+    digit_1 = find_first_digit(calibration_value, forward)
+    digit_2 = find_first_digit(reversed(calibration_value), backward)
+    return 10 * digit_1 + digit_2
 
 
 def part_1(puzzle_input: Tuple[str] = p1) -> int:
@@ -110,4 +170,4 @@ def part_2(puzzle_input: Tuple[str] = p1) -> int:
 
     What is the sum of all of the calibration values?
     """
-    return sum(construct_calibration_number(replace_nums(v)) for v in puzzle_input)
+    return sum(construct_calibration_number(v, spelled_automata) for v in puzzle_input)
@@ -0,0 +1,35 @@
+"""
+Advent of Code - Day 01, whole document engine
+
+Works on the calibration document as a single bytes buffer instead of a tuple
+of lines, every line is handled at once with NumPy masks and reductions.
+"""
+import numpy as np
+
+from aoc.day_01.seed import p1
+
+document = "\n".join(p1).encode()
+
+
+def calibration_numbers(buffer: bytes) -> np.ndarray:
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    digit_positions = np.flatnonzero((data >= ord("0")) & (data <= ord("9")))
+    if not len(digit_positions):
+        return np.zeros(0, dtype=np.int64)
+    newlines = np.flatnonzero(data == ord("\n"))
+    # Line index of every digit, digits are already ordered by position. Lines
+    # without any digit simply never show up.
+    line_of_digit = np.searchsorted(newlines, digit_positions)
+    line_change = np.diff(line_of_digit, prepend=-1) != 0
+    first = np.flatnonzero(line_change)
+    last = np.append(first[1:], len(digit_positions)) - 1
+    values = data[digit_positions].astype(np.int64) - ord("0")
+    return 10 * values[first] + values[last]
+
+
+def part_1(buffer: bytes = document) -> int:
+    """
+    Consider your entire calibration document. What is the sum of all of the
+    calibration values?
+    """
+    return int(calibration_numbers(buffer).sum())
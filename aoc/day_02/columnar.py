@@ -0,0 +1,62 @@
+"""
+Advent of Code - Day 02, columnar game store
+
+The parsed games are stored once as NumPy columns, so many bag configurations
+can be checked against every game in a single vectorized call.
+"""
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from aoc.day_02.core import parse_games
+from aoc.day_02.seed import p1
+
+# Upper bound on the size of the (bags x games) mask built per chunk
+cell_budget = 1 << 24
+
+
+class GameColumns(NamedTuple):
+    ids: np.ndarray
+    red: np.ndarray
+    green: np.ndarray
+    blue: np.ndarray
+
+
+def build_columns(games: list[dict]) -> GameColumns:
+    def column(values: list[int]) -> np.ndarray:
+        return np.array(values, dtype=np.int64)
+
+    return GameColumns(
+        column([game["id"] for game in games]),
+        column([game["max_set"]["red"] for game in games]),
+        column([game["max_set"]["green"] for game in games]),
+        column([game["max_set"]["blue"] for game in games]),
+    )
+
+
+def valid_id_sums(columns: GameColumns, bags: ArrayLike) -> np.ndarray:
+    """
+    Input: bag configurations as rows of (red, green, blue)
+    Output: the sum of the ids of the games possible with each bag
+    """
+    bags = np.asarray(bags, dtype=np.int64).reshape(-1, 3)
+    sums = np.empty(len(bags), dtype=np.int64)
+    step = max(1, cell_budget // max(1, len(columns.ids)))
+    for start in range(0, len(bags), step):
+        chunk = slice(start, start + step)
+        # Each colour becomes a (chunk, 1) column broadcast against the games
+        red, green, blue = bags[chunk].T[:, :, None]
+        fits = (columns.red <= red) & (columns.green <= green) & (columns.blue <= blue)
+        sums[chunk] = fits @ columns.ids
+    return sums
+
+
+def part_1(puzzle_input: str = p1) -> int:
+    """
+    Determine which games would have been possible if the bag had been loaded
+    with only 12 red cubes, 13 green cubes, and 14 blue cubes. What is the sum
+    of the IDs of those games?
+    """
+    columns = build_columns(parse_games(puzzle_input))
+    return int(valid_id_sums(columns, np.array([(12, 13, 14)]))[0])
@@ -51,10 +51,11 @@ If you add up the IDs of the games that would have been possible, you get 8.
 
 """
 
+import re
 from collections import defaultdict
 from functools import reduce
 from operator import mul
-from typing import Tuple
+from typing import Iterable, Iterator, NamedTuple
 
 from aoc.day_02.seed import p1
 
@@ -100,6 +101,47 @@ def parse_games(puzzle_input: str) -> list[dict]:
     return [parse_game(game) for game in game_strings]
 
 
+class Game(NamedTuple):
+    # Compact record of a game, only the max of each colour is kept
+    id: int
+    red: int
+    green: int
+    blue: int
+
+
+cube_pattern = re.compile(r"(\d+) (red|green|blue)")
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    # Chunks may end mid line, the unfinished tail is carried over
+    tail = ""
+    for chunk in chunks:
+        *lines, tail = (tail + chunk).split("\n")
+        yield from lines
+    if tail:
+        yield tail
+
+
+def fold_game(game_string: str) -> Game:
+    """
+    Input: Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+    Output: Game(id=1, red=4, green=2, blue=6)
+    """
+    [game_info, unparsed_sets] = game_string.split(":")
+    max_set = dict.fromkeys(colours, 0)
+    for cubes in cube_pattern.finditer(unparsed_sets):
+        max_set[cubes[2]] = max(max_set[cubes[2]], int(cubes[1]))
+    return Game(int(game_info.split()[-1]), **max_set)
+
+
+def stream_games(chunks: Iterable[str]) -> Iterator[Game]:
+    """
+    Folds games one at a time from arbitrary chunks of text, such as the lines
+    of an open file, without keeping the individual sets around.
+    """
+    return (fold_game(line) for line in iter_lines(chunks) if line.strip())
+
+
 def check_cube_constraints(
     cube_constraints: dict[str, int],
     game: dict[str, int],
@@ -120,15 +162,30 @@ def find_valid_games(
     ]
 
 
+def is_possible_game(
+    cube_constraints: dict[str, int],
+    unparsed_sets: str,
+) -> bool:
+    # Cubes are tokenized lazily, the first count over its limit ends the scan
+    return all(
+        int(cubes[1]) <= cube_constraints[cubes[2]]
+        for cubes in cube_pattern.finditer(unparsed_sets)
+    )
+
+
 def part_1(puzzle_input: str = p1) -> int:
     """
     Determine which games would have been possible if the bag had been loaded
     with only 12 red cubes, 13 green cubes, and 14 blue cubes. What is the sum
     of the IDs of those games?
     """
-    data = parse_games(puzzle_input)
-    valid_games = find_valid_games({"red": 12, "green": 13, "blue": 14}, data)
-    return sum(game["id"] for game in valid_games)
+    cube_constraints = {"red": 12, "green": 13, "blue": 14}
+    games = (line.split(":") for line in iter_lines([puzzle_input]) if line.strip())
+    return sum(
+        int(game_info.split()[-1])
+        for [game_info, unparsed_sets] in games
+        if is_possible_game(cube_constraints, unparsed_sets)
+    )
 
 
 def game_power(game: dict) -> int:
@@ -172,5 +229,5 @@ def part_2(puzzle_input: str = p1) -> int:
     For each game, find the minimum set of cubes that must have been present.
     What is the sum of the power of these sets?
     """
-    data = parse_games(puzzle_input)
-    return sum(game_power(game["max_set"]) for game in data)
+    games = stream_games([puzzle_input])
+    return sum(game.red * game.green * game.blue for game in games)
@@ -0,0 +1,168 @@
+"""
+Advent of Code - Day 02, precomputed game indexes
+
+A game fits in a bag when the bag dominates its max set on every colour. Cube
+counts are small integers, so after compressing each colour to the values that
+actually occur, a 3-D prefix sum over (red, green, blue) answers "which games
+fit this bag" aggregates with one binary search per colour.
+
+Games can also be indexed by id, with prefix sums of their powers and of the
+part 1 validity, so aggregates over any window of ids cost two lookups. Ids are
+normally dense, then the prefix sums are laid out by id and a lookup is plain
+indexing. Sparse ids would make that layout huge, so they are kept sorted and
+looked up with a binary search instead.
+"""
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from aoc.day_02.columnar import GameColumns, build_columns
+from aoc.day_02.core import check_cube_constraints, game_power, parse_games
+from aoc.day_02.seed import p1
+
+
+class FitTotals(NamedTuple):
+    id_sum: np.ndarray
+    game_count: np.ndarray
+    power_sum: np.ndarray
+
+
+class DominanceIndex(NamedTuple):
+    # Distinct values per colour, the axes of the prefix sum cubes
+    red: np.ndarray
+    green: np.ndarray
+    blue: np.ndarray
+    # Cumulative totals, with a leading zero plane on every axis
+    id_sum: np.ndarray
+    game_count: np.ndarray
+    power_sum: np.ndarray
+
+
+def build_dominance_index(columns: GameColumns) -> DominanceIndex:
+    colours = (columns.red, columns.green, columns.blue)
+    axes = [np.unique(values) for values in colours]
+    cells = tuple(
+        np.searchsorted(axis, values) + 1 for axis, values in zip(axes, colours)
+    )
+    shape = tuple(len(axis) + 1 for axis in axes)
+
+    def prefix_cube(weights: np.ndarray) -> np.ndarray:
+        cube = np.zeros(shape, dtype=np.int64)
+        np.add.at(cube, cells, weights)
+        for axis in range(3):
+            np.cumsum(cube, axis=axis, out=cube)
+        return cube
+
+    red, green, blue = axes
+    return DominanceIndex(
+        red,
+        green,
+        blue,
+        prefix_cube(columns.ids),
+        prefix_cube(np.ones_like(columns.ids)),
+        prefix_cube(columns.red * columns.green * columns.blue),
+    )
+
+
+def fitting_games(index: DominanceIndex, bags: ArrayLike) -> FitTotals:
+    """
+    Input: bag configurations as rows of (red, green, blue)
+    Output: sum of ids, count and sum of powers of the games fitting each bag
+    """
+    red, green, blue = np.asarray(bags, dtype=np.int64).reshape(-1, 3).T
+    cell = (
+        np.searchsorted(index.red, red, side="right"),
+        np.searchsorted(index.green, green, side="right"),
+        np.searchsorted(index.blue, blue, side="right"),
+    )
+    return FitTotals(index.id_sum[cell], index.game_count[cell], index.power_sum[cell])
+
+
+def part_1(puzzle_input: str = p1) -> int:
+    """
+    Determine which games would have been possible if the bag had been loaded
+    with only 12 red cubes, 13 green cubes, and 14 blue cubes. What is the sum
+    of the IDs of those games?
+    """
+    index = build_dominance_index(build_columns(parse_games(puzzle_input)))
+    return int(fitting_games(index, np.array([(12, 13, 14)])).id_sum[0])
+
+
+part_1_constraints = {"red": 12, "green": 13, "blue": 14}
+# Ids count as dense while the largest is below this many slots per game
+dense_id_ratio = 4
+
+
+class RangeTotals(NamedTuple):
+    power_sum: np.ndarray
+    valid_count: np.ndarray
+    valid_id_sum: np.ndarray
+
+
+class IdRangeIndex(NamedTuple):
+    # Sorted ids, or None when the prefix sums are indexed by id directly
+    ids: np.ndarray | None
+    # Prefix sums in id order, with a leading zero
+    power_sum: np.ndarray
+    valid_count: np.ndarray
+    valid_id_sum: np.ndarray
+
+
+def build_id_range_index(
+    games: list[dict],
+    cube_constraints: dict[str, int] | None = None,
+) -> IdRangeIndex:
+    # Validity is judged against the part 1 bag unless told otherwise
+    if cube_constraints is None:
+        cube_constraints = dict(part_1_constraints)
+    ids = np.array([game["id"] for game in games], dtype=np.int64)
+    powers = np.array([game_power(game["max_set"]) for game in games], dtype=np.int64)
+    valid = np.array(
+        [check_cube_constraints(cube_constraints, game["max_set"]) for game in games],
+        dtype=np.int64,
+    )
+    if len(ids) and ids.max() < dense_id_ratio * len(ids):
+        # One slot per id up to the largest, prefix[i] covers the ids below i
+        def prefix_sum(values: np.ndarray) -> np.ndarray:
+            slots = np.zeros(ids.max() + 2, dtype=np.int64)
+            np.add.at(slots, ids + 1, values)
+            return np.cumsum(slots)
+
+        return IdRangeIndex(
+            None, prefix_sum(powers), prefix_sum(valid), prefix_sum(valid * ids)
+        )
+
+    order = np.argsort(ids, kind="stable")
+    ids, powers, valid = ids[order], powers[order], valid[order]
+
+    def sorted_prefix_sum(values: np.ndarray) -> np.ndarray:
+        return np.concatenate(([0], np.cumsum(values)))
+
+    return IdRangeIndex(
+        ids,
+        sorted_prefix_sum(powers),
+        sorted_prefix_sum(valid),
+        sorted_prefix_sum(valid * ids),
+    )
+
+
+def id_range_totals(
+    index: IdRangeIndex, first: ArrayLike, last: ArrayLike
+) -> RangeTotals:
+    """
+    Input: inclusive id windows [first, last], scalars or arrays of windows
+    Output: sum of powers, valid game count and valid id sum in each window
+    """
+    if index.ids is None:
+        limit = len(index.power_sum) - 1
+        start = np.clip(first, 0, limit)
+        stop = np.clip(np.asarray(last) + 1, 0, limit)
+    else:
+        start = np.searchsorted(index.ids, first, side="left")
+        stop = np.searchsorted(index.ids, last, side="right")
+    return RangeTotals(
+        index.power_sum[stop] - index.power_sum[start],
+        index.valid_count[stop] - index.valid_count[start],
+        index.valid_id_sum[stop] - index.valid_id_sum[start],
+    )
@@ -0,0 +1,74 @@
+"""
+Advent of Code - Day 03, row bitmask engine
+
+Each row's symbols are stored as one int with bit c set for column c. Shifting
+a row mask left and right and or-ing it with the rows above and below gives
+every cell next to a symbol, so a number is a part number when a single AND
+with its span is non zero. All the heavy lifting is C-level big int work.
+"""
+import re
+from collections import defaultdict
+from typing import Iterable, Iterator
+
+from aoc.day_03.seed import p1
+
+number_pattern = re.compile(r"\d+")
+# Digits and "." become "0", so anything left that isn't "0" is a symbol
+blank = str.maketrans("0123456789.", "0" * 11)
+
+
+def symbol_mask(line: str) -> int:
+    return int(re.sub(r"[^0]", "1", line.translate(blank))[::-1] or "0", 2)
+
+
+def gear_mask(line: str) -> int:
+    return int(re.sub(r"[^*]", "0", line).replace("*", "1")[::-1] or "0", 2)
+
+
+def dilate(mask: int) -> int:
+    return mask | mask << 1 | mask >> 1
+
+
+def neighbourhoods(masks: Iterable[int]) -> Iterator[int]:
+    # Cells next to a set bit on the same row or the rows above and below
+    dilated = [0, *map(dilate, masks), 0]
+    for row in range(1, len(dilated) - 1):
+        yield dilated[row - 1] | dilated[row] | dilated[row + 1]
+
+
+def span(start: int, end: int) -> int:
+    return ((1 << (end - start)) - 1) << start
+
+
+def part_1(puzzle_input: str = p1) -> int:
+    """
+    What is the sum of all of the part numbers in the engine schematic?
+    """
+    lines = puzzle_input.splitlines()
+    return sum(
+        int(number.group())
+        for line, near_symbol in zip(lines, neighbourhoods(map(symbol_mask, lines)))
+        for number in number_pattern.finditer(line)
+        if near_symbol & span(number.start(), number.end())
+    )
+
+
+def part_2(puzzle_input: str = p1) -> int:
+    """
+    What is the sum of all of the gear ratios in your engine schematic?
+    """
+    lines = puzzle_input.splitlines()
+    gears = [0, *map(gear_mask, lines), 0]
+    cogs: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for row, line in enumerate(lines, start=1):
+        for number in number_pattern.finditer(line):
+            number_area = dilate(span(number.start(), number.end()))
+            for gear_row in range(row - 1, row + 2):
+                hits = gears[gear_row] & number_area
+                while hits:
+                    lowest = hits & -hits
+                    cogs[gear_row, lowest.bit_length() - 1].append(int(number.group()))
+                    hits ^= lowest
+    return sum(
+        numbers[0] * numbers[1] for numbers in cogs.values() if len(numbers) == 2
+    )
@@ -39,9 +39,9 @@ Here is an example engine schematic:
 .664.598..
 
 """
+from array import array
 from re import finditer
-from more_itertools import partition
-from typing import NamedTuple, Iterator
+from typing import Iterable, NamedTuple, Iterator
 from operator import mul
 
 from aoc.day_03.seed import p1
@@ -54,15 +54,31 @@ class Token(NamedTuple):
     column: int
 
 
+class TokenColumns(NamedTuple):
+    # Struct of arrays, token i is kind[i], value[i], ... Symbols are stored
+    # by their code point, end is the column just past the token. Values only
+    # become a list of Python ints once a number doesn't fit in int64.
+    kind: array
+    value: array | list[int]
+    line: array
+    start: array
+    end: array
+
+
+# Kinds in TokenColumns
+NUMBER, SYMBOL = 0, 1
+
+token_specification = (
+    ("NUMBER", r"\d+"),
+    ("SYMBOL", r"[^\d\n.]"),
+    ("NEWLINE", r"\n"),
+)
+token_pattern = "|".join(
+    f"(?P<{group}>{pattern})" for group, pattern in token_specification
+)
+
+
 def tokenizer(raw_data: str) -> Iterator[Token]:
-    token_specification = (
-        ("NUMBER", r"\d+"),
-        ("SYMBOL", r"[^\d\n.]"),
-        ("NEWLINE", r"\n"),
-    )
-    token_pattern = "|".join(
-        f"(?P<{group}>{pattern})" for group, pattern in token_specification
-    )
     line_num = 1
     line_start = 0
     for match in finditer(token_pattern, raw_data):
@@ -84,16 +100,91 @@ def tokenizer(raw_data: str) -> Iterator[Token]:
         yield Token(kind, value, line_num, column)
 
 
-def is_adjacent(number: Token, symbol: Token) -> bool:
-    # Collision detection
-    return bool(
-        # Make sure line is in allowed range, +2 for inclusive comparison
-        number.line in range(symbol.line - 1, symbol.line + 2)
-        and
-        # If any columns of the numbers intersect with symbol column ±1
-        set(range(number.column, number.column + len(str(number.value))))
-        & set(range(symbol.column - 1, symbol.column + 2))
-    )
+def append_value(columns: TokenColumns, value: int) -> TokenColumns:
+    try:
+        columns.value.append(value)
+    except OverflowError:
+        columns = columns._replace(value=[*columns.value, value])
+    return columns
+
+
+def tokenize_columns(raw_data: str) -> TokenColumns:
+    columns = TokenColumns(*(array("q") for _ in TokenColumns._fields))
+    line_num = 1
+    line_start = 0
+    for match in finditer(token_pattern, raw_data):
+        match match.lastgroup:
+            case "NUMBER":
+                kind, value = NUMBER, int(match.group())
+            case "SYMBOL":
+                kind, value = SYMBOL, ord(match.group())
+            case "NEWLINE":
+                line_start = match.end()
+                line_num = line_num + 1
+                continue
+            case _:
+                raise ValueError("Unhandled token")
+        columns = append_value(columns, value)
+        columns.kind.append(kind)
+        columns.line.append(line_num)
+        columns.start.append(match.start() - line_start)
+        columns.end.append(match.end() - line_start)
+    return columns
+
+
+def pack_tokens(tokens: Iterable[Token]) -> TokenColumns:
+    columns = TokenColumns(*(array("q") for _ in TokenColumns._fields))
+    for token in tokens:
+        is_number = token.type == "NUMBER"
+        value = int(token.value) if is_number else ord(str(token.value))
+        columns = append_value(columns, value)
+        columns.kind.append(NUMBER if is_number else SYMBOL)
+        columns.line.append(token.line)
+        columns.start.append(token.column)
+        columns.end.append(token.column + len(str(token.value)))
+    return columns
+
+
+def neighbourhood(line: int, start: int, end: int) -> Iterator[tuple[int, int]]:
+    # Every (line, column) cell in the bounding box around a token
+    for neighbour_line in range(line - 1, line + 2):
+        for column in range(start - 1, end + 1):
+            yield neighbour_line, column
+
+
+def part_numbers(tokens: TokenColumns) -> Iterator[int]:
+    # Spatial index, each number only looks at the cells around it
+    symbols = {
+        (line, start)
+        for kind, line, start in zip(tokens.kind, tokens.line, tokens.start)
+        if kind == SYMBOL
+    }
+    for kind, value, line, start, end in zip(*tokens):
+        if kind == NUMBER and any(
+            cell in symbols for cell in neighbourhood(line, start, end)
+        ):
+            yield value
+
+
+def gear_ratios(tokens: TokenColumns) -> Iterator[int]:
+    # Spatial index from every cell covered by a number to its token index
+    numbers = {
+        (line, column): index
+        for index, (kind, line, start, end) in enumerate(
+            zip(tokens.kind, tokens.line, tokens.start, tokens.end)
+        )
+        if kind == NUMBER
+        for column in range(start, end)
+    }
+    for kind, value, line, start, end in zip(*tokens):
+        if kind == SYMBOL and value == ord("*"):
+            cogs = {
+                numbers[cell]
+                for cell in neighbourhood(line, start, end)
+                if cell in numbers
+            }
+            if len(cogs) == 2:
+                yield mul(*(tokens.value[cog] for cog in cogs))
 
 
 def part_1(puzzle_input: str = p1) -> int:
@@ -105,16 +196,7 @@ def part_1(puzzle_input: str = p1) -> int:
     Of course, the actual engine schematic is much larger. What is the sum of
     all of the part numbers in the engine schematic?
     """
-    tokens = tokenizer(puzzle_input)
-    # Split up the tokens to reduce unecessary filtering in search
-    (symbol_gen, numbers) = partition(lambda t: t.type == "NUMBER", tokens)
-    symbols = list(symbol_gen)  # We iterate per number
-    part_numbers: Iterator[int] = (
-        int(number.value)
-        for number in numbers
-        if any(is_adjacent(number, symbol) for symbol in symbols)
-    )
-    return sum(part_numbers)
+    return sum(part_numbers(tokenize_columns(puzzle_input)))
 
 
 def part_2(puzzle_input: str = p1) -> int:
@@ -161,14 +243,4 @@ def part_2(puzzle_input: str = p1) -> int:
 
     What is the sum of all of the gear ratios in your engine schematic?
     """
-    tokens = tokenizer(puzzle_input)
-    # Split up the tokens to reduce unecessary filtering in search
-    (symbol_gen, number_gen) = partition(lambda t: t.type == "NUMBER", tokens)
-    numbers = list(number_gen)
-    gears = (
-        mul(*cogs)
-        for gear in symbol_gen
-        if gear.value == "*"
-        and len(cogs := [cog.value for cog in numbers if is_adjacent(cog, gear)]) == 2
-    )
-    return sum(gears)
+    return sum(gear_ratios(tokenize_columns(puzzle_input)))
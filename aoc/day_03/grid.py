@@ -0,0 +1,104 @@
+"""
+Advent of Code - Day 03, NumPy grid engine
+
+The schematic is loaded as a 2-D uint8 array. Part numbers are the digit runs
+touched by the symbol mask dilated with a 3x3 neighbourhood, gear ratios come
+from the distinct digit run labels around each "*".
+"""
+import numpy as np
+
+from aoc.day_03.seed import p1
+
+dot, zero, nine, star = (ord(char) for char in ".09*")
+# Longest digit run evaluated in int64, gear ratios of two such numbers still
+# fit. Longer runs fall back to Python ints.
+max_int64_digits = 9
+
+
+def load_grid(raw_data: str) -> np.ndarray:
+    # Blank rows inside the schematic are kept, only the ends are trimmed
+    lines = [line.encode() for line in raw_data.strip("\r\n").splitlines()]
+    width = max(map(len, lines), default=0)
+    # Border of "." all around, neighbours never fall off the grid and digit
+    # runs never continue onto the next row when flattened.
+    grid = np.full((len(lines) + 2, width + 2), dot, dtype=np.uint8)
+    grid[1:-1, 1:-1] = np.frombuffer(
+        b"".join(line.ljust(width, b".") for line in lines), dtype=np.uint8
+    ).reshape(len(lines), width)
+    return grid
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    rows = mask.copy()
+    rows[1:] |= mask[:-1]
+    rows[:-1] |= mask[1:]
+    dilated = rows.copy()
+    dilated[:, 1:] |= rows[:, :-1]
+    dilated[:, :-1] |= rows[:, 1:]
+    return dilated
+
+
+def label_numbers(grid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Output: label of the digit run covering each cell (0 outside numbers) and
+    the value of every label, with values[0] == 0. Values are int64 while every
+    run has at most max_int64_digits digits, Python ints otherwise.
+    """
+    digits = ((grid >= zero) & (grid <= nine)).ravel()
+    starts = digits.copy()
+    starts[1:] &= ~digits[:-1]
+    ends = digits.copy()
+    ends[:-1] &= ~digits[1:]
+    labels = np.cumsum(starts) * digits
+
+    run_starts, run_ends = np.flatnonzero(starts), np.flatnonzero(ends)
+    if (run_ends - run_starts).max(initial=0) >= max_int64_digits:
+        cells = grid.tobytes()
+        values = np.array(
+            [0, *(int(cells[a:b]) for a, b in zip(run_starts, run_ends + 1))],
+            dtype=object,
+        )
+        return labels.reshape(grid.shape), values
+
+    positions = np.flatnonzero(digits)
+    run = labels[positions]
+    exponent = run_ends[run - 1] - positions
+    place_values = (grid.ravel()[positions].astype(np.int64) - zero) * 10**exponent
+    values = np.zeros(len(run_starts) + 1, dtype=np.int64)
+    np.add.at(values, run, place_values)
+    return labels.reshape(grid.shape), values
+
+
+def part_1(puzzle_input: str = p1) -> int:
+    """
+    What is the sum of all of the part numbers in the engine schematic?
+    """
+    grid = load_grid(puzzle_input)
+    labels, values = label_numbers(grid)
+    symbols = ((grid < zero) | (grid > nine)) & (grid != dot)
+    return int(values[np.unique(labels[dilate(symbols)])].sum())
+
+
+def part_2(puzzle_input: str = p1) -> int:
+    """
+    What is the sum of all of the gear ratios in your engine schematic?
+    """
+    grid = load_grid(puzzle_input)
+    labels, values = label_numbers(grid)
+    rows, columns = np.nonzero(grid == star)
+    around = np.sort(
+        np.stack(
+            [
+                labels[rows + row_offset, columns + column_offset]
+                for row_offset in (-1, 0, 1)
+                for column_offset in (-1, 0, 1)
+            ],
+            axis=1,
+        ),
+        axis=1,
+    )
+    # First occurrence of every non zero label around each gear
+    distinct = around != 0
+    distinct[:, 1:] &= around[:, 1:] != around[:, :-1]
+    ratios = np.where(distinct, values[around], 1).prod(axis=1)
+    return int(ratios[distinct.sum(axis=1) == 2].sum())
@@ -0,0 +1,112 @@
+"""
+Advent of Code - Day 03, incremental engine
+
+A live schematic that accepts single cell edits. Only the digit run through
+the edited cell is re-tokenized, and only the numbers and gears within one
+cell of it are re-evaluated, while the part number and gear ratio sums are
+kept up to date.
+"""
+from re import finditer
+from typing import NamedTuple
+
+from aoc.day_03.seed import p1
+
+
+class Number(NamedTuple):
+    row: int
+    start: int
+    end: int
+    value: int
+
+
+class Schematic:
+    def __init__(self, raw_data: str = p1) -> None:
+        self.grid = [list(line) for line in raw_data.splitlines()]
+        # Every cell covered by a number points at that number
+        self.numbers: dict[tuple[int, int], Number] = {}
+        for row, line in enumerate(self.grid):
+            self._index_numbers(row, 0, len(line))
+        self.part_sum = sum(
+            number.value
+            for number in set(self.numbers.values())
+            if self._is_part(number)
+        )
+        self.gear_sum = sum(
+            self._gear_ratio(row, column)
+            for row, line in enumerate(self.grid)
+            for column, char in enumerate(line)
+            if char == "*"
+        )
+
+    def __str__(self) -> str:
+        return "\n".join("".join(line) for line in self.grid)
+
+    def edit(self, row: int, column: int, char: str) -> None:
+        # Any number that can merge, split or change through this cell lies
+        # within the digit run around it, so that run bounds the work.
+        start, stop = column, column + 1
+        while self._cell(row, start - 1).isdigit():
+            start -= 1
+        while self._cell(row, stop).isdigit():
+            stop += 1
+
+        self._account(row, column, start, stop, -1)
+        for covered in range(start, stop):
+            self.numbers.pop((row, covered), None)
+        self.grid[row][column] = char
+        self._index_numbers(row, start, stop)
+        self._account(row, column, start, stop, 1)
+
+    def _account(self, row: int, column: int, start: int, stop: int, sign: int) -> None:
+        # Numbers next to the edited cell may gain or lose their symbol, the
+        # ones in the run may change altogether, gears see both.
+        numbers = self._numbers_in(row - 1, row + 1, column - 1, column + 1)
+        numbers |= self._numbers_in(row, row, start, stop - 1)
+        self.part_sum += sign * sum(
+            number.value for number in numbers if self._is_part(number)
+        )
+        self.gear_sum += sign * sum(
+            self._gear_ratio(gear_row, gear_column)
+            for gear_row in range(row - 1, row + 2)
+            for gear_column in range(start - 1, stop + 1)
+        )
+
+    def _cell(self, row: int, column: int) -> str:
+        if 0 <= row < len(self.grid) and 0 <= column < len(self.grid[row]):
+            return self.grid[row][column]
+        return "."
+
+    def _index_numbers(self, row: int, start: int, stop: int) -> None:
+        segment = "".join(self.grid[row][start:stop])
+        for match in finditer(r"\d+", segment):
+            number = Number(
+                row, start + match.start(), start + match.end(), int(match.group())
+            )
+            for column in range(number.start, number.end):
+                self.numbers[row, column] = number
+
+    def _numbers_in(
+        self, first_row: int, last_row: int, first_column: int, last_column: int
+    ) -> set[Number]:
+        return {
+            self.numbers[row, column]
+            for row in range(first_row, last_row + 1)
+            for column in range(first_column, last_column + 1)
+            if (row, column) in self.numbers
+        }
+
+    def _is_part(self, number: Number) -> bool:
+        return any(
+            not (char := self._cell(row, column)).isdigit() and char != "."
+            for row in range(number.row - 1, number.row + 2)
+            for column in range(number.start - 1, number.end + 1)
+        )
+
+    def _gear_ratio(self, row: int, column: int) -> int:
+        if self._cell(row, column) != "*":
+            return 0
+        cogs = self._numbers_in(row - 1, row + 1, column - 1, column + 1)
+        if len(cogs) != 2:
+            return 0
+        first, second = cogs
+        return first.value * second.value
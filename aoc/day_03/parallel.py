@@ -0,0 +1,74 @@
+"""
+Advent of Code - Day 03, parallel striped engine
+
+The schematic is split into horizontal stripes, each carrying one halo row
+above and below, and the stripes are solved in a process pool. A stripe only
+reports part numbers and gears on its own rows, the halo rows are there for
+context, so everything on a stripe boundary is counted exactly once.
+"""
+from math import ceil
+from os import cpu_count
+from typing import Iterator
+
+from multiprocess import Pool
+from multiprocess.pool import Pool as PoolType
+
+from aoc.day_03.seed import p1
+from aoc.day_03.stream import scan
+
+# Stripe lines, then the first and last line (1-based) owned by the stripe
+Stripe = tuple[list[str], int, int]
+
+
+def stripes(lines: list[str], stripe_height: int) -> Iterator[Stripe]:
+    for start in range(0, len(lines), stripe_height):
+        stop = min(start + stripe_height, len(lines))
+        halo_start, halo_stop = max(start - 1, 0), stop + 1
+        yield lines[halo_start:halo_stop], start - halo_start + 1, stop - halo_start
+
+
+def solve_stripe(stripe: Stripe) -> tuple[int, int]:
+    lines, first, last = stripe
+    totals = {"PART": 0, "GEAR": 0}
+    for token in scan(lines):
+        if first <= token.line <= last:
+            totals[token.type] += int(token.value)
+    return totals["PART"], totals["GEAR"]
+
+
+def solve(
+    puzzle_input: str,
+    processes: int | None = None,
+    stripe_height: int | None = None,
+    pool: PoolType | None = None,
+) -> tuple[int, int]:
+    """
+    Output: the sum of the part numbers and the sum of the gear ratios
+
+    A running pool can be passed in to solve several schematics without
+    starting new processes every time, processes then only sizes the stripes.
+    """
+    lines = puzzle_input.splitlines()
+    processes = processes or cpu_count() or 1
+    # A few stripes per process keeps the pool busy on uneven stripes
+    stripe_height = stripe_height or max(1, ceil(len(lines) / (processes * 4)))
+    if pool:
+        results = pool.map(solve_stripe, stripes(lines, stripe_height))
+    else:
+        with Pool(processes) as pool:
+            results = pool.map(solve_stripe, stripes(lines, stripe_height))
+    return sum(part for part, _ in results), sum(gear for _, gear in results)
+
+
+def part_1(puzzle_input: str = p1) -> int:
+    """
+    What is the sum of all of the part numbers in the engine schematic?
+    """
+    return solve(puzzle_input)[0]
+
+
+def part_2(puzzle_input: str = p1) -> int:
+    """
+    What is the sum of all of the gear ratios in your engine schematic?
+    """
+    return solve(puzzle_input)[1]
@@ -0,0 +1,57 @@
+"""
+Advent of Code - Day 03, sparse engine
+
+Mostly empty schematics are kept as a list of tokens, each with its line,
+column and value, instead of the full rectangle of text. Solving works on the
+tokens alone so time and memory scale with the number of tokens, the text form
+is only produced on request.
+
+The sparse text format has one token per line: "<line> <column> <value>".
+"""
+from typing import Iterable, Iterator
+
+from aoc.day_03.core import Token, gear_ratios, pack_tokens, part_numbers, tokenizer
+from aoc.day_03.seed import p1
+
+
+def from_schematic(raw_data: str) -> list[Token]:
+    return list(tokenizer(raw_data))
+
+
+def to_schematic(tokens: Iterable[Token], width: int = 0, height: int = 0) -> str:
+    # Trailing empty rows and columns are not recorded, pad up to the given size
+    tokens = list(tokens)
+    height = max([height, *(token.line for token in tokens)])
+    width = max([width, *(token.column + len(str(token.value)) for token in tokens)])
+    grid = [["."] * width for _ in range(height)]
+    for token in tokens:
+        end = token.column + len(str(token.value))
+        grid[token.line - 1][token.column : end] = str(token.value)
+    return "".join(f"{''.join(row)}\n" for row in grid)
+
+
+def dumps(tokens: Iterable[Token]) -> str:
+    return "".join(f"{token.line} {token.column} {token.value}\n" for token in tokens)
+
+
+def loads(sparse_data: str) -> Iterator[Token]:
+    for entry in sparse_data.splitlines():
+        line, column, value = entry.split()
+        if value.isdigit():
+            yield Token("NUMBER", int(value), int(line), int(column))
+        else:
+            yield Token("SYMBOL", value, int(line), int(column))
+
+
+def part_1(tokens: Iterable[Token] = from_schematic(p1)) -> int:
+    """
+    What is the sum of all of the part numbers in the engine schematic?
+    """
+    return sum(part_numbers(pack_tokens(tokens)))
+
+
+def part_2(tokens: Iterable[Token] = from_schematic(p1)) -> int:
+    """
+    What is the sum of all of the gear ratios in your engine schematic?
+    """
+    return sum(gear_ratios(pack_tokens(tokens)))
@@ -0,0 +1,88 @@
+"""
+Advent of Code - Day 03, streaming engine
+
+Reads the schematic one line at a time keeping only the rows above and below
+the current one, part numbers and gears are emitted as soon as their
+neighbourhood is complete. Memory is bounded by the row width.
+"""
+import re
+from bisect import bisect_right
+from itertools import chain
+from typing import Iterable, Iterator, NamedTuple
+
+from aoc.day_03.core import Token
+from aoc.day_03.seed import p1
+
+number_pattern = re.compile(r"\d+")
+symbol_pattern = re.compile(r"[^\d\n.]")
+gear_pattern = re.compile(r"\*")
+
+
+class Row(NamedTuple):
+    line: str
+    numbers: list[re.Match]
+    # Start column of every number, to bisect on
+    starts: list[int]
+
+
+def make_row(line: str) -> Row:
+    numbers = list(number_pattern.finditer(line))
+    return Row(line, numbers, [number.start() for number in numbers])
+
+
+def numbers_near(row: Row, column: int) -> Iterator[re.Match]:
+    # Numbers are sorted and at least one cell apart, so only the last two
+    # starting by column + 1 can reach back to column - 1.
+    stop = bisect_right(row.starts, column + 1)
+    first = max(stop - 2, 0)
+    for number in row.numbers[first:stop]:
+        if number.end() >= column:
+            yield number
+
+
+def windows(lines: Iterable[str]) -> Iterator[tuple[Row, Row, Row]]:
+    # Rows outside the schematic are empty
+    empty = Row("", [], [])
+    rows = (make_row(raw_line.rstrip("\n")) for raw_line in lines)
+    above, row = empty, next(rows, None)
+    if row is None:
+        return
+    for below in chain(rows, [empty]):
+        yield above, row, below
+        above, row = row, below
+
+
+def scan(lines: Iterable[str]) -> Iterator[Token]:
+    """
+    Yields a PART token for every part number and a GEAR token holding the
+    ratio of every gear, row by row.
+    """
+    for line_num, window in enumerate(windows(lines), start=1):
+        _, row, _ = window
+        for number in row.numbers:
+            start, end = max(number.start() - 1, 0), number.end() + 1
+            if any(symbol_pattern.search(r.line, start, end) for r in window):
+                yield Token("PART", int(number.group()), line_num, number.start())
+        for gear in gear_pattern.finditer(row.line):
+            column = gear.start()
+            cogs = [
+                int(number.group())
+                for r in window
+                for number in numbers_near(r, column)
+            ]
+            if len(cogs) == 2:
+                yield Token("GEAR", cogs[0] * cogs[1], line_num, column)
+
+
+def part_1(lines: Iterable[str] = p1.splitlines()) -> int:
+    """
+    What is the sum of all of the part numbers in the engine schematic?
+    """
+    return sum(int(token.value) for token in scan(lines) if token.type == "PART")
+
+
+def part_2(lines: Iterable[str] = p1.splitlines()) -> int:
+    """
+    What is the sum of all of the gear ratios in your engine schematic?
+    """
+    return sum(int(token.value) for token in scan(lines) if token.type == "GEAR")
@@ -1,51 +1,167 @@
 """
 Advent of Code - Day 04
 """
-from typing import NamedTuple, Iterator
+from collections import deque
+from itertools import chain
+from typing import Iterable, NamedTuple, Iterator
 import re
 
+from more_itertools import last
+
 from aoc.day_04.seed import p1
 
 
 class Card(NamedTuple):
+    # Numbers are stored as bitmasks, bit n is set when n is on the card
     id: int
-    card_numbers: set[int]
-    winning_numbers: set[int]
+    card_numbers: int
+    winning_numbers: int
+
+
+def to_bitmask(numbers: str) -> int:
+    values = [int(v) for v in numbers.split()]
+    mask = 0
+    for value in values:
+        mask |= 1 << value
+    # Just to make sure double winnings isn't possible
+    assert mask.bit_count() == len(values)
+    return mask
+
+
+def matches(card: Card) -> int:
+    return (card.winning_numbers & card.card_numbers).bit_count()
+
+
+# pattern = r"Card (P<id>\d+):(P<card>(\s+(\d+))+) \|(P<winning>(\s+(\d+))+)"
+card_pattern = re.compile(r"Card\s+(\d+):((\s+\d+)+) \|((\s+\d+)+)")
+
+
+class Layout(NamedTuple):
+    # Column layout of a fixed width deck, detected from its first card
+    length: int
+    colon: int
+    bar: int
+    width: int
+    card_offsets: range
+    winning_offsets: range
+
+
+def detect_layout(line: str) -> Layout:
+    colon, bar = line.index(":"), line.index("|")
+    # Every number is right aligned in a field of the same width
+    card_side = line[colon + 1 : bar - 1]
+    width = len(card_side) // len(card_side.split())
+    return Layout(
+        len(line),
+        colon,
+        bar,
+        width,
+        range(colon + 1, bar - 1, width),
+        range(bar + 1, len(line), width),
+    )
+
+
+def fields_bitmask(line: str, offsets: range, width: int) -> int:
+    mask = 0
+    for offset in offsets:
+        mask |= 1 << int(line[offset : offset + width])
+    # Just to make sure double winnings isn't possible
+    assert mask.bit_count() == len(offsets)
+    return mask
+
+
+def fits_layout(line: str, layout: Layout) -> bool:
+    # Fields have to be a space then a right aligned number to be aligned
+    fields = (
+        line[offset : offset + layout.width]
+        for offset in chain(layout.card_offsets, layout.winning_offsets)
+    )
+    return (
+        len(line) == layout.length
+        and line[layout.colon] == ":"
+        and line[layout.bar - 1 : layout.bar + 1] == " |"
+        and line[4 : layout.colon].lstrip().isdigit()
+        and all(field[0] == " " and field.lstrip().isdigit() for field in fields)
+    )
 
 
 def parse(raw_str: str) -> Iterator[Card]:
-    # pattern = r"Card (P<id>\d+):(P<card>(\s+(\d+))+) \|(P<winning>(\s+(\d+))+)"
-    pattern = r"Card\s+(\d+):((\s+\d+)+) \|((\s+\d+)+)"
-    for line in raw_str.splitlines():
-        for match in re.findall(pattern, line):
-            # Just to make sure double winnings isn't possible
-            assert len(set(int(v) for v in match[3].split())) == len(
-                list(int(v) for v in match[3].split())
-            )
-            assert len(set(int(v) for v in match[1].split())) == len(
-                list(int(v) for v in match[1].split())
-            )
+    return parse_lines(raw_str.splitlines())
+
+
+def parse_lines(lines: Iterable[str]) -> Iterator[Card]:
+    """
+    Any iterable of lines works, like a file or a pipe read lazily. Numbers are
+    sliced out by offset using the layout of the first card, lines that don't
+    fit that layout fall back to the regular expression.
+    """
+    layout = None
+    for line in lines:
+        line = line.rstrip("\n")
+        if layout is None and card_pattern.match(line):
+            layout = detect_layout(line)
+        if layout is not None and fits_layout(line, layout):
             yield Card(
-                int(match[0]),
-                set(int(v) for v in match[1].split()),
-                set(int(v) for v in match[3].split()),
+                int(line[4 : layout.colon]),
+                fields_bitmask(line, layout.card_offsets, layout.width),
+                fields_bitmask(line, layout.winning_offsets, layout.width),
             )
+            continue
+        for match in card_pattern.findall(line):
+            yield Card(int(match[0]), to_bitmask(match[1]), to_bitmask(match[3]))
 
 
 def part_1(puzzle_input: str = p1) -> int:
     """"""
     cards = parse(puzzle_input)
-    return sum(
-        2 ** (exp - 1)
-        for card in cards
-        if (exp := len(card.winning_numbers & card.card_numbers)) > 0
-    )
+    return sum(2 ** (exp - 1) for card in cards if (exp := matches(card)) > 0)
+
+
+class DeckTotals:
+    """
+    Part 1 score and part 2 card count of a deck that keeps getting cards
+    appended to it, each new card costs O(matches).
+    """
+
+    def __init__(self) -> None:
+        self.score = 0
+        self.card_count = 0
+        # Copies won by earlier cards for the cards still to come, the window
+        # is never longer than the most matches on a single card.
+        self.pending: deque[int] = deque()
+
+    def add(self, card: Card) -> None:
+        self.add_matches(matches(card))
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        for card in cards:
+            self.add(card)
+
+    def add_matches(self, won_cards: int) -> None:
+        if won_cards > 0:
+            self.score += 2 ** (won_cards - 1)
+        copies = 1 + (self.pending.popleft() if self.pending else 0)
+        self.card_count += copies
+        self.pending.extend([0] * (won_cards - len(self.pending)))
+        for won in range(won_cards):
+            self.pending[won] += copies
+
+
+def running_totals(winners: Iterable[int]) -> Iterator[int]:
+    """
+    Input: the number of matches of each card, in order
+    Output: the total number of cards so far, after each card
+    """
+    totals = DeckTotals()
+    for won_cards in winners:
+        totals.add_matches(won_cards)
+        yield totals.card_count
+
+
+def count_cards(winners: Iterable[int]) -> int:
+    return last(running_totals(winners), 0)
 
 
 def part_2(puzzle_input: str = p1) -> int:
     """"""
-    cards = list(parse(puzzle_input))
-    for card in cards:
-        winners = card.winning_numbers & card.card_numbers
-        cards += cards[card.id : card.id + len(winners)]
-    return len(cards)
+    return count_cards(matches(card) for card in parse(puzzle_input))
@@ -0,0 +1,68 @@
+"""
+Advent of Code - Day 04, vectorized engine
+
+The whole deck is parsed into one integer table, one row per card, and the
+numbers on each side are turned into one-hot matrices. Matches for every card
+come from a single AND and row sum.
+"""
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+from aoc.day_04.core import count_cards
+from aoc.day_04.seed import p1
+
+
+class Deck(NamedTuple):
+    ids: np.ndarray
+    # One row per card, one column per number
+    card_numbers: np.ndarray
+    winning_numbers: np.ndarray
+
+
+def parse_deck(raw_str: str) -> Deck:
+    if not raw_str.strip():
+        empty = np.zeros((0, 0), dtype=np.int64)
+        return Deck(np.zeros(0, dtype=np.int64), empty, empty)
+    # Every card has the same number of numbers on each side
+    first_card = raw_str.strip().split("\n", 1)[0]
+    card_side, winning_side = first_card.split(":")[1].split("|")
+    card_count, winning_count = len(card_side.split()), len(winning_side.split())
+    row_width = 1 + card_count + winning_count
+    numbers = np.fromstring(re.sub(r"Card|:|\|", " ", raw_str), dtype=np.int64, sep=" ")
+    if numbers.size % row_width:
+        raise ValueError(
+            f"Cards don't all have {card_count} numbers and {winning_count} "
+            "winning numbers like the first one"
+        )
+    table = numbers.reshape(-1, row_width)
+    ids, card_numbers, winning_numbers = np.split(table, [1, 1 + card_count], axis=1)
+    return Deck(ids[:, 0], card_numbers, winning_numbers)
+
+
+def one_hot(numbers: np.ndarray, size: int) -> np.ndarray:
+    hot = np.zeros((len(numbers), size), dtype=bool)
+    hot[np.arange(len(numbers))[:, None], numbers] = True
+    return hot
+
+
+def match_counts(deck: Deck) -> np.ndarray:
+    size = (
+        max(deck.card_numbers.max(initial=0), deck.winning_numbers.max(initial=0)) + 1
+    )
+    card_hot = one_hot(deck.card_numbers, size)
+    return (card_hot & one_hot(deck.winning_numbers, size)).sum(axis=1)
+
+
+def part_1(puzzle_input: str = p1) -> int:
+    """"""
+    matches = match_counts(parse_deck(puzzle_input))
+    # 2 ** (matches - 1), and 0 for no matches
+    return int((np.left_shift(1, matches) >> 1).sum())
+
+
+def part_2(puzzle_input: str = p1) -> int:
+    """"""
+    # Copies cascade card by card and overflow int64, plain ints from here
+    return count_cards(match_counts(parse_deck(puzzle_input)).tolist())
@@ -4,9 +4,10 @@ Advent of Code - Day 05
 
 from aoc.day_05.seed import p1
 import re
-from typing import NamedTuple, Callable
-from functools import reduce
-from itertools import batched, chain, count
+from bisect import bisect_right
+from typing import NamedTuple, Iterator
+from functools import lru_cache, reduce
+from itertools import batched
 
 
 class MapRange(NamedTuple):
@@ -17,7 +18,25 @@ class MapRange(NamedTuple):
 
 class Map(NamedTuple):
     name: str
-    ranges: list[MapRange]
+    ranges: tuple[MapRange, ...]
+    # The ranges ordered by src and by dest, with their starts to bisect on
+    by_src: tuple[MapRange, ...]
+    src_starts: tuple[int, ...]
+    by_dest: tuple[MapRange, ...]
+    dest_starts: tuple[int, ...]
+
+
+def make_map(name: str, ranges: tuple[MapRange, ...]) -> Map:
+    by_src = tuple(sorted(ranges, key=lambda map_range: map_range.src))
+    by_dest = tuple(sorted(ranges, key=lambda map_range: map_range.dest))
+    return Map(
+        name,
+        ranges,
+        by_src,
+        tuple(map_range.src for map_range in by_src),
+        by_dest,
+        tuple(map_range.dest for map_range in by_dest),
+    )
 
 
 def get_range_pos(map_range: MapRange, pos: int) -> int | None:
@@ -27,19 +46,28 @@ def get_range_pos(map_range: MapRange, pos: int) -> int | None:
     return map_range.dest + (pos - map_range.src)
 
 
-def get_map_pos(
-    pos: int,
-    map_: Map,
-    get_pos: Callable[[MapRange, int], int | None] = get_range_pos,
-) -> int:
-    return next(
-        (
-            dest_pos
-            for map_range in map_.ranges
-            if (dest_pos := get_pos(map_range, pos)) is not None
-        ),
-        pos,
-    )
+def get_map_pos(pos: int, map_: Map) -> int:
+    # Only the last range starting at or before pos can hold it
+    index = bisect_right(map_.src_starts, pos) - 1
+    if index < 0:
+        return pos
+    dest_pos = get_range_pos(map_.by_src[index], pos)
+    return pos if dest_pos is None else dest_pos
+
+
+def get_range_pos_inv(map_range: MapRange, pos: int) -> int | None:
+    if not map_range.dest <= pos < map_range.dest + map_range.length:
+        # Out of bounds
+        return None
+    return map_range.src + (pos - map_range.dest)
+
+
+def get_map_pos_inv(pos: int, map_: Map) -> int:
+    index = bisect_right(map_.dest_starts, pos) - 1
+    if index < 0:
+        return pos
+    src_pos = get_range_pos_inv(map_.by_dest[index], pos)
+    return pos if src_pos is None else src_pos
 
 
 num = r"(\d+)"
@@ -48,54 +76,124 @@ num = r"(\d+)"
 def parse_map(map_raw: str) -> Map:
     [map_name, *map_data] = map_raw.splitlines()
     map_name = map_name[0:-5]
-    map_numbers = [
+    map_numbers = tuple(
         MapRange(*[int(seed.group()) for seed in re.finditer(num, line)])
         for line in map_data
-    ]
-    return Map(
-        map_name,
-        map_numbers,
     )
+    return make_map(map_name, map_numbers)
 
 
-def parse(puzzle_input: str) -> tuple[list[int], list[Map]]:
+def parse(puzzle_input: str) -> tuple[list[int], tuple[Map, ...]]:
+    # Maps are immutable and hashable so the composed chain can be cached
     [seeds_r, *maps_r] = puzzle_input.split("\n\n")
     seeds = [int(seed.group()) for seed in re.finditer(num, seeds_r)]
-    maps = list(map(parse_map, maps_r))
+    maps = tuple(map(parse_map, maps_r))
     return seeds, maps
 
 
 def part_1(puzzle_input: str = p1) -> int:
     """"""
     seeds, maps = parse(puzzle_input)
-    locations = list(
-        reduce(lambda pos, seed_map: get_map_pos(pos, seed_map), maps, seed)
-        for seed in seeds
-    )
-    return min(locations)
+    seed_to_location = compose_maps(maps)
+    return min(get_piecewise_pos(seed, seed_to_location) for seed in seeds)
+
+
+def split_at_map(start: int, stop: int, map_: Map) -> Iterator[tuple[int, int, int]]:
+    """
+    Splits the positions [start, stop) wherever they cross the boundary of a
+    map range, only visiting the map ranges that overlap them.
+    Output: (start, stop, offset) parts, in order, offset 0 for unmapped gaps
+    """
+    # The last range starting at or before start is the first that can overlap
+    first = max(bisect_right(map_.src_starts, start) - 1, 0)
+    for index in range(first, len(map_.by_src)):
+        map_range = map_.by_src[index]
+        src_stop = map_range.src + map_range.length
+        if start >= stop or map_range.src >= stop:
+            break
+        if src_stop <= start:
+            continue
+        if start < map_range.src:
+            yield start, map_range.src, 0
+            start = map_range.src
+        overlap_stop = min(stop, src_stop)
+        yield start, overlap_stop, map_range.dest - map_range.src
+        start = overlap_stop
+    if start < stop:
+        yield start, stop, 0
+
+
+def map_ranges(positions: list[range], map_: Map) -> list[range]:
+    """
+    Pushes whole ranges of positions through a map, splitting them wherever
+    they cross the boundary of a map range.
+    """
+    return [
+        range(start + offset, stop + offset)
+        for positions_range in positions
+        for start, stop, offset in split_at_map(
+            positions_range.start, positions_range.stop, map_
+        )
+    ]
 
 
-def get_range_pos_inv(map_range: MapRange, pos: int) -> int | None:
-    if not map_range.dest <= pos < map_range.dest + map_range.length:
-        # Out of bounds
-        return None
-    return map_range.src + (pos - map_range.dest)
+class PiecewiseMap(NamedTuple):
+    # Contiguous pieces covering every position from 0, piece i starts at
+    # starts[i] and moves its positions by offsets[i]. Tuples, so a cached
+    # map can be shared safely.
+    starts: tuple[int, ...]
+    offsets: tuple[int, ...]
+
+
+# Positions past this are outside the composed map
+position_limit = 1 << 64
+
+
+# Only the last few almanacs keep their composed chain
+@lru_cache(maxsize=16)
+def compose_maps(maps: tuple[Map, ...]) -> PiecewiseMap:
+    """
+    Folds a chain of maps into a single piecewise linear map, so a position
+    goes through the whole chain with one binary search.
+    """
+    pieces = [(0, position_limit, 0)]
+    for map_ in maps:
+        # Split each piece where its image crosses a boundary of the next map
+        pieces = [
+            (start - offset, stop - offset, offset + map_offset)
+            for piece_start, piece_stop, offset in pieces
+            for start, stop, map_offset in split_at_map(
+                piece_start + offset, piece_stop + offset, map_
+            )
+        ]
+    starts: list[int] = []
+    offsets: list[int] = []
+    for start, _, offset in pieces:
+        # Neighbours moving by the same offset are one piece
+        if not offsets or offsets[-1] != offset:
+            starts.append(start)
+            offsets.append(offset)
+    return PiecewiseMap(tuple(starts), tuple(offsets))
+
+
+def get_piecewise_pos(pos: int, piecewise: PiecewiseMap) -> int:
+    return pos + piecewise.offsets[bisect_right(piecewise.starts, pos) - 1]
+
+
+def get_piecewise_min(positions: range, piecewise: PiecewiseMap) -> int:
+    # Pieces only move positions, so each piece is lowest at its first position
+    piece = bisect_right(piecewise.starts, positions.start) - 1
+    lowest = positions.start + piecewise.offsets[piece]
+    for piece in range(piece + 1, len(piecewise.starts)):
+        if piecewise.starts[piece] >= positions.stop:
+            break
+        lowest = min(lowest, piecewise.starts[piece] + piecewise.offsets[piece])
+    return lowest
 
 
 def part_2(puzzle_input: str = p1) -> int:
     """"""
     seeds, maps = parse(puzzle_input)
     seed_ranges = [range(seed, seed + length) for (seed, length) in batched(seeds, 2)]
-    print("Start part 2")
-    for loc in count():
-        # Back search
-        seed = reduce(
-            lambda pos, seed_map: get_map_pos(pos, seed_map, get_range_pos_inv),
-            reversed(maps),
-            loc,
-        )
-        # Check if loc is in any of the ranges
-        # print(f"{seed} -> {loc}")
-        if any(r.start <= seed <= r.stop for r in seed_ranges):
-            return loc
-    return 0
+    locations = reduce(map_ranges, maps, seed_ranges)
+    return min(location.start for location in locations)
@@ -1,6 +1,12 @@
 from typing import Any
 
-from aoc.day_01.core import part_1, part_2, construct_calibration_number
+from aoc.day_01.core import (
+    part_1,
+    part_2,
+    construct_calibration_number,
+    spelled_automata,
+)
+from aoc.day_01 import vectorized
 
 sample_seed_1 = (
     "1abc2",
@@ -60,3 +66,20 @@ def test_samples() -> None:
 def test_calibration_construction() -> None:
     for value, answer in zip(sample_seed_1, partial_answers):
         assert construct_calibration_number(value) == answer
+
+
+def test_overlapping_spelled_digits() -> None:
+    assert construct_calibration_number("eightwo", spelled_automata) == 82
+    assert construct_calibration_number("zoneight234", spelled_automata) == 14
+    assert construct_calibration_number("sevenine", spelled_automata) == 79
+    assert construct_calibration_number("twone", spelled_automata) == 21
+
+
+def test_vectorized() -> None:
+    assert vectorized.part_1() == 55123
+    assert vectorized.part_1("\n".join(sample_seed_1).encode()) == 142
+    assert list(vectorized.calibration_numbers(b"1abc2\ntreb7uchet\n")) == [12, 77]
+    # Documents without any digit have no calibration values
+    for buffer in (b"", b"abc\n", b"abc"):
+        assert len(vectorized.calibration_numbers(buffer)) == 0
+        assert vectorized.part_1(buffer) == 0
@@ -1,6 +1,9 @@
+from itertools import batched
 from typing import Any
 
-from aoc.day_02.core import part_1, part_2
+from aoc.day_02.core import part_1, part_2, parse_games, stream_games, Game
+from aoc.day_02.core import is_possible_game
+from aoc.day_02 import columnar, index
 
 sample_seed_1 = """
     Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
@@ -35,3 +38,52 @@ def test_samples() -> None:
 
     for data, expected in examples:
         verify_day(data, *expected)
+
+
+def test_columnar() -> None:
+    assert columnar.part_1() == 2416
+    columns = columnar.build_columns(parse_games(sample_seed_1))
+    bags = [(12, 13, 14), (20, 13, 15), (0, 0, 0), (4, 3, 6)]
+    assert list(columnar.valid_id_sums(columns, bags)) == [8, 15, 0, 3]
+
+
+def test_dominance_index() -> None:
+    assert index.part_1() == 2416
+    columns = columnar.build_columns(parse_games(sample_seed_1))
+    dominance = index.build_dominance_index(columns)
+    bags = [(12, 13, 14), (20, 13, 15), (0, 0, 0), (4, 3, 6)]
+    totals = index.fitting_games(dominance, bags)
+    assert list(totals.id_sum) == [8, 15, 0, 3]
+    assert list(totals.game_count) == [3, 5, 0, 2]
+    assert list(totals.power_sum) == [96, 2286, 0, 60]
+
+
+def test_stream_games() -> None:
+    # Chunk boundaries falling anywhere, including inside a line
+    games = list(stream_games(map("".join, batched(sample_seed_1, 7))))
+    assert games[0] == Game(1, red=4, green=2, blue=6)
+    assert [game.id for game in games] == [1, 2, 3, 4, 5]
+    assert games == list(stream_games(sample_seed_1.splitlines(True)))
+
+
+def test_is_possible_game() -> None:
+    constraints = {"red": 12, "green": 13, "blue": 14}
+    assert is_possible_game(constraints, " 3 blue, 4 red; 1 red, 2 green, 6 blue")
+    assert not is_possible_game(constraints, " 20 red; 1 blue, 5 yellow")
+
+
+def test_id_range_index() -> None:
+    id_range = index.build_id_range_index(parse_games(sample_seed_1))
+    assert index.id_range_totals(id_range, 1, 5) == (2286, 3, 8)
+    assert index.id_range_totals(id_range, 2, 4) == (1560 + 630 + 12, 1, 2)
+    totals = index.id_range_totals(id_range, [1, 3, 6], [2, 3, 9])
+    assert list(totals.power_sum) == [60, 1560, 0]
+    assert list(totals.valid_id_sum) == [3, 0, 0]
+    # Sparse ids are binary searched and agree with the dense layout
+    games = parse_games(sample_seed_1)
+    sparse = index.build_id_range_index(
+        [{**game, "id": game["id"] * 100} for game in games]
+    )
+    assert id_range.ids is None and sparse.ids is not None
+    assert index.id_range_totals(sparse, 100, 500) == (2286, 3, 800)
+    assert index.id_range_totals(sparse, 101, 499) == (1560 + 630 + 12, 1, 200)
@@ -1,6 +1,12 @@
+from random import Random
 from typing import Any
 
-from aoc.day_03.core import part_1, part_2
+from multiprocess import get_context
+
+from aoc.day_03.core import part_1, part_2, tokenize_columns, NUMBER, SYMBOL
+from aoc.day_03 import bitmask, grid, parallel, sparse, stream
+from aoc.day_03.incremental import Schematic
+from aoc.day_03.seed import p1
 
 sample_seed_1 = """467..114..
 ...*......
@@ -39,3 +45,101 @@ def test_samples() -> None:
 
     for data, expected in examples:
         verify_day(data, *expected)
+
+
+def test_wide_neighbours() -> None:
+    # A number touching a gear with several digits still counts once
+    assert part_2("111\n.*.\n.22\n") == 2442
+    assert part_2("111\n.*.\n...\n") == 0
+    assert part_1("111\n...\n..#\n") == 0
+
+
+def test_grid() -> None:
+    assert grid.part_1() == 521601
+    assert grid.part_2() == 80694070
+    assert grid.part_1(sample_seed_1) == 4361
+    assert grid.part_2(sample_seed_1) == 467835
+    assert grid.part_2("111\n.*.\n.22\n") == 2442
+    # Blank rows keep their place, empty schematics have no numbers
+    assert grid.part_1("..4.33\n\n1.#.2..\n") == part_1("..4.33\n\n1.#.2..\n") == 0
+    assert grid.part_1("") == grid.part_2("") == 0
+    # Long digit runs and their gear ratios do not overflow
+    assert grid.part_1("9" * 20 + "\n#\n") == 10**20 - 1
+    gear = "9" * 12 + "\n*\n" + "8" * 12 + "\n"
+    assert grid.part_2(gear) == 999999999999 * 888888888888
+
+
+def test_stream() -> None:
+    assert stream.part_1() == 521601
+    assert stream.part_2() == 80694070
+    # Lines straight from a file keep their newline
+    lines = sample_seed_1.splitlines(True)
+    assert stream.part_1(lines) == 4361
+    assert stream.part_2(iter(lines)) == 467835
+    # Wide rows with numbers and gears packed together agree with core
+    random = Random(11)
+    wide = "\n".join(
+        "".join(random.choice("...1234*#") for _ in range(3000)) for _ in range(5)
+    )
+    assert stream.part_1(wide.splitlines()) == part_1(wide)
+    assert stream.part_2(wide.splitlines()) == part_2(wide)
+
+
+def test_tokenize_columns() -> None:
+    tokens = tokenize_columns("467..114..\n...*......\n")
+    assert list(tokens.kind) == [NUMBER, NUMBER, SYMBOL]
+    assert list(tokens.value) == [467, 114, ord("*")]
+    assert list(tokens.line) == [1, 1, 2]
+    assert list(tokens.start) == [0, 5, 3]
+    assert list(tokens.end) == [3, 8, 4]
+    # Numbers past int64 are kept exact
+    huge = 2**64 + 1
+    tokens = tokenize_columns(f"1.{huge}\n.#\n")
+    assert list(tokens.value) == [1, huge, ord("#")]
+    assert part_1(f"1.{huge}\n.#\n") == 1 + huge
+    assert part_2(f"{huge}\n.*2\n") == 2 * huge
+
+
+def test_parallel() -> None:
+    # One spawned pool for every case, forking inside the threaded test
+    # workers may deadlock
+    with get_context("spawn").Pool(2) as pool:
+        assert parallel.solve(p1, 2, pool=pool) == (521601, 80694070)
+        # Every stripe height puts some numbers and gears on stripe boundaries
+        for stripe_height in range(1, 11):
+            assert parallel.solve(sample_seed_1, 2, stripe_height, pool) == answers
+
+
+def test_incremental() -> None:
+    schematic = Schematic()
+    assert (schematic.part_sum, schematic.gear_sum) == (521601, 80694070)
+
+    schematic = Schematic(sample_seed_1)
+    assert (schematic.part_sum, schematic.gear_sum) == answers
+    random = Random(2023)
+    for _ in range(500):
+        row, column = random.randrange(10), random.randrange(10)
+        schematic.edit(row, column, random.choice("..123*#"))
+        expected = (part_1(str(schematic)), part_2(str(schematic)))
+        assert (schematic.part_sum, schematic.gear_sum) == expected
+
+
+def test_sparse() -> None:
+    assert sparse.part_1() == 521601
+    assert sparse.part_2() == 80694070
+    tokens = sparse.from_schematic(sample_seed_1)
+    assert sparse.dumps(tokens).splitlines()[:3] == ["1 0 467", "1 5 114", "2 3 *"]
+    assert list(sparse.loads(sparse.dumps(tokens))) == tokens
+    assert sparse.to_schematic(tokens, width=10) == sample_seed_1
+    assert (sparse.part_1(tokens), sparse.part_2(tokens)) == answers
+    # Far apart tokens never need the rectangle between them
+    far = sparse.loads("1 0 12\n2 2 *\n3 3 34\n1000000 999999 #\n")
+    assert sparse.part_2(far) == 408
+
+
+def test_bitmask() -> None:
+    assert bitmask.part_1() == 521601
+    assert bitmask.part_2() == 80694070
+    assert bitmask.part_1(sample_seed_1) == 4361
+    assert bitmask.part_2(sample_seed_1) == 467835
+    assert bitmask.symbol_mask("..#.*.1$") == 0b10010100
@@ -1,6 +1,17 @@
 from typing import Any
 
-from aoc.day_04.core import part_1, part_2
+import pytest
+
+from aoc.day_04.core import (
+    part_1,
+    part_2,
+    parse,
+    parse_lines,
+    matches,
+    running_totals,
+    DeckTotals,
+)
+from aoc.day_04 import vectorized
 
 sample_seed_1 = """
 Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53
@@ -38,3 +49,64 @@ def test_samples() -> None:
 
     for data, expected in examples:
         verify_day(data, *expected)
+
+
+def winning_deck(size: int) -> str:
+    # Every card wins the next 5, the last 5 win nothing
+    win, lose = "1 2 3 4 5 | 1 2 3 4 5", "1 2 3 4 5 | 6 7 8 9 10"
+    return "\n".join(
+        f"Card {i}: {win if i <= size - 5 else lose}" for i in range(1, size + 1)
+    )
+
+
+def test_many_copies() -> None:
+    assert part_2(winning_deck(20)) == 143525
+    # The number of copies grows exponentially with the deck size
+    assert part_2(winning_deck(1000)) > 2**900
+
+
+def test_matches() -> None:
+    cards = list(parse(sample_seed_1))
+    assert cards[0].card_numbers == sum(1 << n for n in (41, 48, 83, 86, 17))
+    assert [matches(card) for card in cards] == [4, 2, 2, 1, 0, 0]
+
+
+def test_vectorized() -> None:
+    assert vectorized.part_1() == 25174
+    assert vectorized.part_2() == 6420979
+    assert vectorized.part_1(sample_seed_1) == 13
+    assert vectorized.part_2(sample_seed_1) == 30
+    deck = vectorized.parse_deck(sample_seed_1)
+    assert list(vectorized.match_counts(deck)) == [4, 2, 2, 1, 0, 0]
+    assert vectorized.part_1("") == vectorized.part_2("\n") == part_1("") == 0
+    with pytest.raises(ValueError, match="Cards don't all have 2 numbers"):
+        vectorized.parse_deck("Card 1: 1 2 | 3 4\nCard 2: 1 2 3 | 4 5\n")
+
+
+def test_running_totals() -> None:
+    lines = iter(sample_seed_1.splitlines(True))
+    winners = (matches(card) for card in parse_lines(lines))
+    assert list(running_totals(winners)) == [1, 3, 7, 15, 29, 30]
+
+
+def test_fixed_width_parse() -> None:
+    assert list(parse(sample_seed_1)) == list(parse(sample_seed_1.replace("  ", " ")))
+    # Cards not matching the layout of the first one still parse
+    deck = "Card 1: 41 48 | 83 48\nCard   2: 1 2 | 3 1 9\n"
+    assert [matches(card) for card in parse(deck)] == [1, 1]
+    # Aligned lines with a field that isn't a number are left to the regex
+    deck = "Card 1:  1  5 |  3  1\nCard 2:  1 x5 |  3  4\n"
+    assert [matches(card) for card in parse(deck)] == [1]
+    # A number running into the bar isn't sliced apart either
+    deck = "Card 1:  1  5 |  3  1\nCard 2:  1  23|  3  4\n"
+    assert [matches(card) for card in parse(deck)] == [1]
+
+
+def test_deck_totals() -> None:
+    totals = DeckTotals()
+    cards = sample_seed_1.splitlines()
+    totals.extend(parse_lines(cards[:3]))
+    assert (totals.score, totals.card_count) == (part_1("\n".join(cards[:3])), 7)
+    for card in parse_lines(cards[3:]):
+        totals.add(card)
+    assert (totals.score, totals.card_count) == answers
@@ -1,6 +1,9 @@
 from typing import Any
 
-from aoc.day_05.core import part_1, part_2, get_map_pos, parse
+from aoc.day_05.core import part_1, part_2, get_map_pos, parse, map_ranges
+from aoc.day_05.core import compose_maps, get_piecewise_pos, get_piecewise_min
+from aoc.day_05.core import get_map_pos_inv, make_map, MapRange
+from functools import reduce
 from itertools import accumulate
 
 sample_seed_1 = """
@@ -90,8 +93,7 @@ def test_parts() -> None:
     # Oracle says so
     #                   25316841
     assert part_1() == 486613012
-    # assert part_2() == 56931769
-    pass
+    assert part_2() == 56931769
 
 
 def verify_day(data: Any, expected_1: Any, expected_2: Any) -> None:
@@ -107,3 +109,60 @@ def test_samples() -> None:
 
     for data, expected in examples:
         verify_day(data, *expected)
+
+
+def test_map_ranges() -> None:
+    seeds, maps = parse(sample_seed_1)
+    # seed-to-soil maps 98-99 to 50-51 and 50-97 to 52-99
+    assert map_ranges([range(40, 100)], maps[0]) == [
+        range(40, 50),
+        range(52, 100),
+        range(50, 52),
+    ]
+    assert map_ranges([range(0, 10), range(200, 210)], maps[0]) == [
+        range(0, 10),
+        range(200, 210),
+    ]
+
+
+def test_compose_maps() -> None:
+    seeds, maps = parse(sample_seed_1)
+    seed_to_location = compose_maps(maps)
+    assert compose_maps(parse(sample_seed_1)[1]) is seed_to_location
+    assert isinstance(seed_to_location.starts, tuple)
+    assert isinstance(seed_to_location.offsets, tuple)
+    for seed, *_, location in seed_path_to_location:
+        assert get_piecewise_pos(seed, seed_to_location) == location
+    for seed in range(0, 120):
+        assert get_piecewise_pos(seed, seed_to_location) == reduce(
+            lambda pos, seed_map: get_map_pos(pos, seed_map), maps, seed
+        )
+    assert get_piecewise_min(range(79, 79 + 14), seed_to_location) == 46
+    assert get_piecewise_min(range(55, 55 + 13), seed_to_location) == 56
+
+
+def test_inverse_lookup() -> None:
+    seeds, maps = parse(sample_seed_1)
+    for seed, *path, location in seed_path_to_location:
+        travel = accumulate(
+            func=lambda pos, seed_map: get_map_pos_inv(pos, seed_map),
+            iterable=reversed(maps),
+            initial=location,
+        )
+        assert list(travel) == [location, *reversed(path), seed]
+
+
+def test_large_maps() -> None:
+    # Tens of thousands of ranges per map, quadratic splitting takes minutes
+    size = 20_000
+    maps = tuple(
+        make_map(
+            name, tuple(MapRange(2 * i + dest, 2 * i + src, 1) for i in range(size))
+        )
+        for name, dest, src in (("a-to-b", 1, 0), ("b-to-c", 0, 1))
+    )
+    positions = [range(2 * i, 2 * i + 1) for i in range(size)]
+    assert map_ranges(positions, maps[0])[-1] == range(2 * size - 1, 2 * size)
+    seed_to_location = compose_maps(maps)
+    assert get_piecewise_pos(2 * size - 2, seed_to_location) == 2 * size - 2
+    assert get_piecewise_pos(2 * size - 1, seed_to_location) == 2 * size - 2